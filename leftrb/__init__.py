@@ -1,6 +1,8 @@
 #!/usr/bin/env python -u
 # encoding: utf-8
 
-from leftrb.llrb import LeftRB
+from leftrb.llrb import LeftRB, LeftRBSet
+from leftrb.btree import LeftB
+from leftrb.frozen import FrozenLLRB
 
-__all__ = ['LeftRB']
+__all__ = ['LeftRB', 'LeftRBSet', 'LeftB', 'FrozenLLRB']
@@ -33,23 +33,12 @@ class BinarySearchTree(object):
         """
         BST tree node.
         """
-        left = right = None
+        __slots__ = ('key', 'val', 'left', 'right')
 
         def __init__(self, key, val=None):
             self.key = key
             self.val = val
-
-        def search(self, key):
-            """
-            Search the subtree for a key. Return a value or None.
-            """
-            if self.key == key:
-                return self.val if self.val is not None else self.key
-            elif key < self.key and self.left:
-                return self.left.search(key)
-            elif self.key < key and self.right:
-                return self.right.search(key)
-            return None
+            self.left = self.right = None
 
         def insert(self, key, value=None):
             """
@@ -69,23 +58,85 @@ class BinarySearchTree(object):
                     self.right = self.right.insert(key, value)
             return self
 
+        def size(self):
+            """
+            Number of nodes in the subtree below node.
+            """
+            n = 0
+            stack = [self]
+            while stack:
+                x = stack.pop()
+                n += 1
+                if x.left is not None:
+                    stack.append(x.left)
+                if x.right is not None:
+                    stack.append(x.right)
+            return n
+
         def min(self):
             """
             Smallest node in the subtree.
             """
-            return self.key if self.left is None else self.left.min()
+            x = self
+            while x.left is not None:
+                x = x.left
+            return x.key
 
         def max(self):
             """
             Largest node in the subtree.
             """
-            return self.key if self.right is None else self.right.max()
+            x = self
+            while x.right is not None:
+                x = x.right
+            return x.key
+
+    def __len__(self):
+        """
+        Number of nodes in the tree.
+        """
+        return 0 if self.root is None else self.root.size()
+
+    def __iter__(self):
+        """
+        Iterate over the keys in order.
+        """
+        for x in self._nodes():
+            yield x.key
+
+    def _nodes(self):
+        """
+        Iterate over the nodes in key order.
+
+        The stack holds only the left spine of the current subtree,
+        so it never grows beyond the height of the tree.
+        """
+        stack = []
+        x = self.root
+        while stack or x is not None:
+            if x is not None:
+                stack.append(x)
+                x = x.left
+            else:
+                x = stack.pop()
+                yield x
+                x = x.right
 
     def search(self, key):
         """
         Search the tree with a key. Return a value or None.
         """
-        return self.root.search(key) if self.root is not None else None
+        x = self.root
+        while x is not None:
+            k = x.key
+            if key < k:
+                x = x.left
+            elif k < key:
+                x = x.right
+            else:
+                val = x.val
+                return val if val is not None else k
+        return None
 
     def insert(self, key, value=None):
         """
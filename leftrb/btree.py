@@ -0,0 +1,170 @@
+#!/usr/bin/env python -u
+# encoding: utf-8
+#
+# Leftrb is a Left-Leaning Red-Black tree implementation in Python.
+# Copyright (c) 2013, Peter Hillerström <peter.hillerstrom@gmail.com>
+#
+# This file is part of Leftrb.
+#
+# Leftrb is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3
+# of the License, or (at your option) any later version.
+#
+# Leftrb is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Leftrb.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Wide fanout B-tree for lookup heavy workloads.
+
+Each node holds up to `max_keys` sorted keys, which are searched
+with a single C-level binary search (bisect) instead of descending
+one binary node at a time.
+"""
+
+from bisect import bisect_left
+
+
+__all__ = ['LeftB']
+
+
+class LeftB(object):
+    """
+    B-tree with up to `max_keys` keys (and `max_keys` + 1 children)
+    per node. Nodes are split bottom-up when they overflow.
+
+    Supports insert and search. For deletes use LeftRB.
+    """
+    max_keys = 8
+
+    class Node(object):
+        """
+        LeftB tree node. Leaves have no children (None).
+        """
+        __slots__ = ('keys', 'vals', 'children')
+
+        def __init__(self, keys, vals, children=None):
+            self.keys = keys
+            self.vals = vals
+            self.children = children
+
+    def __init__(self):
+        self.root = None
+        self.N = 0
+
+    def is_empty(self):
+        """
+        Is the tree empty?
+        """
+        return self.root is None
+
+    def __contains__(self, key):
+        """
+        Does the tree contain key?
+        """
+        return self.search(key) is not None
+
+    def __len__(self):
+        """
+        Number of keys in the tree.
+        """
+        return self.N
+
+    def height(self):
+        """
+        Height of the tree (all leaves are on the same level).
+        """
+        h = 0
+        x = self.root
+        while x is not None:
+            h += 1
+            x = x.children and x.children[0]
+        return h
+
+    def min(self):
+        """
+        Smallest key in the tree.
+        """
+        x = self.root
+        if x is None:
+            return None
+        while x.children is not None:
+            x = x.children[0]
+        return x.keys[0]
+
+    def max(self):
+        """
+        Largest key in the tree.
+        """
+        x = self.root
+        if x is None:
+            return None
+        while x.children is not None:
+            x = x.children[-1]
+        return x.keys[-1]
+
+    def search(self, key):
+        """
+        Search the tree with a key. Return a value or None.
+        """
+        x = self.root
+        while x is not None:
+            keys = x.keys
+            i = bisect_left(keys, key)
+            if i < len(keys) and not key < keys[i]:
+                val = x.vals[i]
+                return val if val is not None else keys[i]
+            x = x.children and x.children[i]
+        return None
+
+    def insert(self, key, value=None):
+        """
+        Insert a key with optional value into the tree.
+        """
+        if self.root is None:
+            self.root = self.Node([key], [value])
+            self.N = 1
+            return
+
+        path = []
+        x = self.root
+        while True:
+            i = bisect_left(x.keys, key)
+            if i < len(x.keys) and not key < x.keys[i]:
+                x.vals[i] = value
+                return
+            if x.children is None:
+                break
+            path.append((x, i))
+            x = x.children[i]
+
+        x.keys.insert(i, key)
+        x.vals.insert(i, value)
+        self.N += 1
+
+        # Split overflowing nodes on the way back up
+        while len(x.keys) > self.max_keys:
+            mid = len(x.keys) // 2
+            right = self.Node(
+                x.keys[mid + 1:],
+                x.vals[mid + 1:],
+                None if x.children is None else x.children[mid + 1:],
+            )
+            key, value = x.keys[mid], x.vals[mid]
+            del x.keys[mid:]
+            del x.vals[mid:]
+            if x.children is not None:
+                del x.children[mid + 1:]
+
+            if not path:
+                self.root = self.Node([key], [value], [x, right])
+                break
+
+            x, i = path.pop()
+            x.keys.insert(i, key)
+            x.vals.insert(i, value)
+            x.children.insert(i + 1, right)
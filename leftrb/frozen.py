@@ -0,0 +1,89 @@
+#!/usr/bin/env python -u
+# encoding: utf-8
+#
+# Leftrb is a Left-Leaning Red-Black tree implementation in Python.
+# Copyright (c) 2013, Peter Hillerström <peter.hillerstrom@gmail.com>
+#
+# This file is part of Leftrb.
+#
+# Leftrb is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3
+# of the License, or (at your option) any later version.
+#
+# Leftrb is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with Leftrb.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Read-only search tree flattened into sorted lists.
+
+Lookups are done with bisect, a binary search that runs in C over
+a contiguous list, so a search costs one call instead of one
+interpreted step per tree level.
+"""
+
+from bisect import bisect_left
+
+
+__all__ = ['FrozenLLRB']
+
+
+class FrozenLLRB(object):
+    """
+    Immutable snapshot of a tree, built with LeftRB.freeze().
+
+    Trades updates for lookup speed: there is no insert or delete,
+    to change the contents build a new snapshot.
+    """
+
+    def __init__(self, keys, vals=None):
+        """
+        Build from sorted, unique keys and optional values in the same order.
+        """
+        self.keys = list(keys)
+        self.vals = [None] * len(self.keys) if vals is None else list(vals)
+
+    def __len__(self):
+        """
+        Number of keys.
+        """
+        return len(self.keys)
+
+    def __contains__(self, key):
+        """
+        Does the tree contain key?
+        """
+        return self.search(key) is not None
+
+    def is_empty(self):
+        """
+        Is the tree empty?
+        """
+        return not self.keys
+
+    def search(self, key):
+        """
+        Search with a key. Return a value or None.
+        """
+        keys = self.keys
+        i = bisect_left(keys, key)
+        if i == len(keys) or key < keys[i]:
+            return None
+        val = self.vals[i]
+        return val if val is not None else keys[i]
+
+    def min(self):
+        """
+        Smallest key.
+        """
+        return self.keys[0] if self.keys else None
+
+    def max(self):
+        """
+        Largest key.
+        """
+        return self.keys[-1] if self.keys else None
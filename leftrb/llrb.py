@@ -29,11 +29,13 @@ http://www.cs.princeton.edu/~rs/talks/LLRB/LLRB.pdf
 by Robert Sedgewick of Princeton University.
 """
 
-import sys
+from operator import itemgetter
+
 from leftrb.bst import BinarySearchTree
+from leftrb.frozen import FrozenLLRB
 
 
-__all__ = ['LeftRB']
+__all__ = ['LeftRB', 'LeftRBSet']
 
 RED = True
 BLACK = False
@@ -43,14 +45,150 @@ def is_red(h):
     """
     Is the node (h) red?
     """
-    return isinstance(h, LeftRB.Node) and h.color == RED
+    return h is not None and h.color
 
 
 def is_black(h):
     """
     Is the node (h) black?
     """
-    return not is_red(h)
+    return h is None or not h.color
+
+
+def _flip_colors(h):
+    """
+    Flip colors of node (h) and its children to split a 4-node
+    """
+    h.color = not h.color
+    h.left.color = not h.left.color
+    h.right.color = not h.right.color
+
+
+def _rotate_left(h):
+    r"""
+    Left rotate (right link of h), where (s) is h
+
+           V         |          V <--left or right, red or black
+           |         |          |
+    out<--(x)   <<< LEFT       (s) <--in
+         // \        |         / \\  <--red
+       (s)   3       |        1   (x)
+       / \           |            / \
+      1   2          |           2   3
+    """
+    x = h.right
+    h.right = two = x.left
+    x.left = h
+    x.color = h.color
+    h.color = RED
+    x.N = h.N
+
+    # Update (s) from subtrees 1 and 2, then (x) from (s) and 3
+    one, three = h.left, x.right
+    lh = one.height if one is not None else 0
+    rh = two.height if two is not None else 0
+    hh = 1 + lh if lh > rh else 1 + rh
+    h.height = hh
+    h.N = 1 + (one.N if one is not None else 0) + (two.N if two is not None else 0)
+    rh = three.height if three is not None else 0
+    x.height = 1 + hh if hh > rh else 1 + rh
+    return x
+
+
+def _rotate_right(h):
+    r"""
+    Right rotate (left link of h), where (s) is h
+
+           V         |          V <--left or right, red or black
+           |         |          |
+    in--> (s)     RIGHT >>>    (x)-->out
+         // \        |         / \\  <--red
+       (x)   3       |        1   (s)
+       / \           |            / \
+      1   2          |           2   3
+    """
+    x = h.left
+    h.left = two = x.right
+    x.right = h
+    x.color = h.color
+    h.color = RED
+    x.N = h.N
+
+    # Update (s) from subtrees 2 and 3, then (x) from 1 and (s)
+    one, three = x.left, h.right
+    lh = two.height if two is not None else 0
+    rh = three.height if three is not None else 0
+    hh = 1 + lh if lh > rh else 1 + rh
+    h.height = hh
+    h.N = 1 + (two.N if two is not None else 0) + (three.N if three is not None else 0)
+    lh = one.height if one is not None else 0
+    x.height = 1 + lh if lh > hh else 1 + hh
+    return x
+
+
+def _descend_min(h, path):
+    """
+    Descend the left spine from node (h), moving red links down
+    and recording the path of (node, went_left) pairs.
+    Return the smallest node, which is left for the caller to unlink.
+    """
+    while h.left is not None:
+        if not h.left.color and is_black(h.left.left):
+            h = h._move_red_left()
+        path.append((h, True))
+        h = h.left
+    return h
+
+
+def _relink(h, path):
+    """
+    Walk back up the path of (node, went_left) pairs, linking the
+    subtree root (h) to its parent and fixing up each parent in turn.
+    Return the new root of the topmost subtree.
+    """
+    while path:
+        parent, went_left = path.pop()
+        if went_left:
+            parent.left = h
+        else:
+            parent.right = h
+        h = parent._fix_up()
+    return h
+
+
+def _build(Node, keys, vals, lo, hi, black_height):
+    """
+    Build a balanced 2-3 tree of the given black height from the
+    sorted keys[lo:hi] and their values. Return the subtree root.
+
+    A 2-node is used when the keys fit, otherwise a 3-node (a black
+    node with a red left child), splitting the keys evenly between
+    the subtrees.
+    """
+    n = hi - lo
+    if n == 0:
+        return None
+
+    most = 3 ** (black_height - 1) - 1  # most keys below a child
+    if n - 1 <= 2 * most:
+        mid = lo + (n - 1) // 2
+        h = Node(keys[mid], vals[mid])
+        h.left = _build(Node, keys, vals, lo, mid, black_height - 1)
+    else:
+        a = (n - 2) // 3
+        b = (n - 2 - a) // 2
+        i = lo + a
+        mid = i + 1 + b
+        red = Node(keys[i], vals[i])
+        red.left = _build(Node, keys, vals, lo, i, black_height - 1)
+        red.right = _build(Node, keys, vals, i + 1, mid, black_height - 1)
+        red._setHeight()
+        h = Node(keys[mid], vals[mid])
+        h.left = red
+
+    h.right = _build(Node, keys, vals, mid + 1, hi, black_height - 1)
+    h.color = BLACK
+    return h._setHeight()
 
 
 class LeftRB(BinarySearchTree, object):
@@ -64,85 +202,148 @@ class LeftRB(BinarySearchTree, object):
     """
     root = None
 
-    class Node(BinarySearchTree.Node, object):
+    class NodeMethods(object):
         """
-        LeftRB tree node.
-        """
-        def __init__(self, key, val=None):
-            super(self.__class__, self).__init__(key, val)
-            self.color = RED  # new nodes are always red
-            self.height = 1
-
-        def insert(self, key, value=None):
-            """
-            Recursively insert a node with key and optional value into the tree below.
-            """
-            # Move this to the end to get 2-3 trees
-            if is_red(self.left) and is_red(self.right):
-                self._flip_colors()
-
-            self = super(LeftRB.Node, self).insert(key, value)
-
-            if is_red(self.right) and is_black(self.left):
-                self = self._rotate_left()
-            if is_red(self.left) and self.left and is_red(self.left.left):
-                self = self._rotate_right()
+        LeftRB tree node operations.
 
-            return self._setHeight()
+        Kept apart from the node fields, so that node classes with
+        different slots (see LeftRBSet) can share them.
+        """
+        __slots__ = ()
 
         def size(self):
             """
             Number of nodes in the subtree below node.
             """
-            # TODO Cache into self.N
-            return 1 + sum(map(lambda child: child.size(), filter(None, [self.left, self.right])))
+            return self.N
 
         def __repr__(self):
-            return "<{0} at {1}, key={2}, value={3}, left={6}, right={7}, color={4}, height={5}>".format(
+            return "<{0} at {1}, key={2}, value={3}, left={6}, right={7}, color={4}, height={5}, N={8}>".format(
                 self.__class__.__name__,
                 id(self),
                 self.key,
                 self.val,
-                'red' if is_red(self) else 'black',
+                'red' if self.color else 'black',
                 self.height,
-                self.left and self.left.key or None,
-                self.right and self.right.key or None,
+                None if self.left is None else self.left.key,
+                None if self.right is None else self.right.key,
+                self.N,
             )
 
-        def _fix_up(self):
+        def insert(self, key, value=None):
             """
-            Fix the Left-leaning Red-black tree properties
-            with upto two rotations and a possible color flip.
+            Insert a key with optional value into the subtree below.
+            Return the new root of the subtree.
+
+            Descends iteratively, and rebalances the visited nodes
+            bottom-up, splitting 4-nodes on the way up (2-3 tree).
             """
-            if is_red(self.right):
-                self = self._rotate_left()
+            path = []
+            h = self
+            while h is not None:
+                k = h.key
+                if key < k:
+                    path.append((h, True))
+                    h = h.left
+                elif k < key:
+                    path.append((h, False))
+                    h = h.right
+                else:
+                    h.val = value
+                    break
 
-            if is_red(self.left) and self.left and is_red(self.left.left):
-                self = self._rotate_right()
+            h = self.__class__(key, value) if h is None else h._balance()
 
-            if is_red(self.left) and is_red(self.right):
-                self._flip_colors()
+            while path:
+                parent, went_left = path.pop()
+                if went_left:
+                    parent.left = h
+                else:
+                    parent.right = h
+                h = parent._balance()
 
-            return self._setHeight()
+            return h
 
-        def _flip_colors(self):
+        def min(self):
             """
-            Flip colors to split a 4-node
+            Smallest node in the subtree.
             """
-            self.color = not self.color
-            self.left.color = not self.left.color
-            self.right.color = not self.right.color
+            x = self
+            while x.left is not None:
+                x = x.left
+            return x.key
+
+        def max(self):
+            """
+            Largest node in the subtree.
+            """
+            x = self
+            while x.right is not None:
+                x = x.right
+            return x.key
+
+        def _balance(self):
+            """
+            Restore the left-leaning property after an insert below
+            with upto two rotations and a possible color flip.
+            """
+            # is_red() inlined on this hot path
+            left, right = self.left, self.right
+            if right is not None and right.color and (left is None or not left.color):
+                self = _rotate_left(self)
+
+            left = self.left
+            if left is not None and left.color and left.left is not None and left.left.color:
+                self = _rotate_right(self)
+
+            # Split 4-nodes on the way up, as delete expects a 2-3 tree
+            left, right = self.left, self.right
+            if left is not None and left.color and right is not None and right.color:
+                _flip_colors(self)
+
+            # _setHeight() inlined
+            lh = left.height if left is not None else 0
+            rh = right.height if right is not None else 0
+            self.height = 1 + lh if lh > rh else 1 + rh
+            self.N = 1 + (left.N if left is not None else 0) + (right.N if right is not None else 0)
+            return self
+
+        def _fix_up(self):
+            """
+            Fix the Left-leaning Red-black tree properties
+            with upto two rotations and a possible color flip.
+            """
+            # is_red() inlined on this hot path
+            right = self.right
+            if right is not None and right.color:
+                self = _rotate_left(self)
+
+            left = self.left
+            if left is not None and left.color and left.left is not None and left.left.color:
+                self = _rotate_right(self)
+
+            left, right = self.left, self.right
+            if left is not None and left.color and right is not None and right.color:
+                _flip_colors(self)
+
+            # _setHeight() inlined
+            lh = left.height if left is not None else 0
+            rh = right.height if right is not None else 0
+            self.height = 1 + lh if lh > rh else 1 + rh
+            self.N = 1 + (left.N if left is not None else 0) + (right.N if right is not None else 0)
+            return self
 
         def _move_red_left(self):
             """
             Assuming that self is red and both self.left and self.left.left
             are black, make self.left or one of its children red.
             """
-            self._flip_colors()
-            if self.right and is_red(self.right.left):
-                self.right = self.right._rotate_right()
-                self = self._rotate_left()
-                self._flip_colors()
+            _flip_colors(self)
+            right = self.right
+            if right is not None and right.left is not None and right.left.color:
+                self.right = _rotate_right(self.right)
+                self = _rotate_left(self)
+                _flip_colors(self)
             return self
 
         def _move_red_right(self):
@@ -150,120 +351,130 @@ class LeftRB(BinarySearchTree, object):
             Assuming that self is red and both self.right and self.right.left
             are black, make self.right or one of its children red.
             """
-            self._flip_colors()
-            if self.left and is_red(self.left.left):
-                self = self._rotate_right()
-                self._flip_colors()
+            _flip_colors(self)
+            left = self.left
+            if left is not None and left.left is not None and left.left.color:
+                self = _rotate_right(self)
+                _flip_colors(self)
             return self
 
-        def _rotate_left(self):
-            """
-            Left rotate (right link of self)
-
-                   V         |          V <--left or right, red or black
-                   |         |          |
-            out<--(x)   <<< LEFT       (s) <--in
-                 // \        |         / \\  <--red
-               (s)   3       |        1   (x)
-               / \           |            / \
-              1   2          |           2   3
-            """
-            x       = self.right
-            self.right = x.left
-            x.left  = self
-            x.color = self.color
-            self.color = RED
-            return x
-
-        def _rotate_right(self):
-            """
-            Right rotate (left link of self)
-
-                   V         |          V <--left or right, red or black
-                   |         |          |
-            in--> (s)     RIGHT >>>    (x)-->out
-                 // \        |         / \\  <--red
-               (x)   3       |        1   (s)
-               / \           |            / \
-              1   2          |           2   3
-            """
-            x       = self.left
-            self.left  = x.right
-            x.right = self
-            x.color = self.color
-            self.color = RED
-            return x
-
         def _delete(self, key):
             """
-            Delete a node with the given key (recursively) from the tree below.
-            """
-            assert self.search(key) is not None
-
-            if key < self.key:
-                if is_black(self.left) and self.left and is_black(self.left.left):
-                    self = self._move_red_left()
-                self.left = self.left._delete(key)
-            else:
-                if is_red(self.left):
-                    self = self._rotate_right()
-
-                if key == self.key and self.right is None:
-                    return None
-
-                if is_black(self.right) and self.right and is_black(self.right.left):
-                    self = self._move_red_right()
-
-                if key == self.key:
-                    self.value = self.right.search(self.right.min())
-                    self.key = self.right.min()
-                    self.right = self.right._delete_min()
-                else:
-                    self.right = self.right._delete(key)
+            Delete a node with the given key from the tree below.
+            Return the new root of the subtree and whether the key was found.
 
-            return self._fix_up()
+            Descends iteratively, moving red links down on the way,
+            and fixes up the visited nodes bottom-up.
+            """
+            path = []
+            found = False
+            h = self
+            while h is not None:
+                if key < h.key:
+                    left = h.left
+                    if left is not None and not left.color and is_black(left.left):
+                        h = h._move_red_left()
+                    path.append((h, True))
+                    h = h.left
+                    continue
+
+                if h.left is not None and h.left.color:
+                    h = _rotate_right(h)
+
+                if key == h.key and h.right is None:
+                    h = None
+                    found = True
+                    break
+
+                right = h.right
+                if right is not None and not right.color and is_black(right.left):
+                    h = h._move_red_right()
+
+                if key == h.key:
+                    # Replace with the successor, found and removed
+                    # on the same descent of the right subtree
+                    path.append((h, False))
+                    successor = _descend_min(h.right, path)
+                    h.key, h.val = successor.key, successor.val
+                    h = None
+                    found = True
+                    break
+
+                path.append((h, False))
+                h = h.right
+
+            return _relink(h, path), found
 
         def _delete_min(self):
             """
             Delete the smallest node on the (left) subtree below
-            while maintaining balance.
+            while maintaining balance. Return the new root of the subtree.
             """
-            if self.left is None:
-                return None
-
-            if is_black(self.left) and self.left and is_black(self.left.left):
-                self = self._move_red_left()
-
-            self.left = self.left._delete_min()
-
-            return self._fix_up()
+            # Every step goes left, so only the nodes are stacked
+            stack = []
+            h = self
+            while h.left is not None:
+                if not h.left.color and is_black(h.left.left):
+                    h = h._move_red_left()
+                stack.append(h)
+                h = h.left
+
+            h = None
+            while stack:
+                parent = stack.pop()
+                parent.left = h
+                h = parent._fix_up()
+            return h
 
         def _delete_max(self):
             """
             Delete the largest node on the (right) subtree below
-            while maintaining balance.
+            while maintaining balance. Return the new root of the subtree.
             """
-            if is_red(self.left):
-                self = self._rotate_right()
-
-            if self.right is None:
-                return None
-
-            if is_black(self.right) and self.right and is_black(self.right.left):
-                self = self._move_red_right()
-
-            self.right = self.right._delete_max()
-
-            return self._fix_up()
+            # Every step goes right, so only the nodes are stacked
+            stack = []
+            h = self
+            while True:
+                if is_red(h.left):
+                    h = _rotate_right(h)
+                if h.right is None:
+                    break
+                if not h.right.color and is_black(h.right.left):
+                    h = h._move_red_right()
+                stack.append(h)
+                h = h.right
+
+            h = None
+            while stack:
+                parent = stack.pop()
+                parent.right = h
+                h = parent._fix_up()
+            return h
 
         def _setHeight(self):
             """
-            Update height.
+            Update height and subtree size.
             """
-            self.height = 1 + max(self.left and self.left.height or 0,
-                                  self.right and self.right.height or 0)
+            left, right = self.left, self.right
+            lh = left.height if left is not None else 0
+            rh = right.height if right is not None else 0
+            self.height = 1 + lh if lh > rh else 1 + rh
+            self.N = 1 + (left.N if left is not None else 0) + (right.N if right is not None else 0)
             return self
 
+    class Node(NodeMethods, BinarySearchTree.Node):
+        """
+        LeftRB tree node.
+        """
+        __slots__ = ('color', 'height', 'N')
+
+        def __init__(self, key, val=None):
+            self.key = key
+            self.val = val
+            self.left = self.right = None
+            self.color = RED  # new nodes are always red
+            self.height = 1
+            self.N = 1  # number of nodes in the subtree
 
     def is_empty(self):
         """
@@ -281,7 +492,7 @@ class LeftRB(BinarySearchTree, object):
         """
         Number of nodes in the tree.
         """
-        return 0 if self.root is None else self.root.size()
+        return 0 if self.root is None else self.root.N
 
     def height(self):
         """
@@ -301,43 +512,136 @@ class LeftRB(BinarySearchTree, object):
         """
         return None if self.root is None else self.root.max()
 
+    @classmethod
+    def from_sorted(cls, keys, values=None):
+        """
+        Build a tree from keys and optional values in the same order
+        in linear time, without any rotations or color flips.
+
+        Unsorted keys are sorted first. For duplicate keys
+        the last value wins. Raise ValueError if values are given
+        and their number differs from the number of keys.
+        """
+        keys = list(keys)
+        vals = [None] * len(keys) if values is None else list(values)
+        if len(vals) != len(keys):
+            raise ValueError("Got {0} keys but {1} values".format(len(keys), len(vals)))
+
+        if any(not keys[i] < keys[i + 1] for i in range(len(keys) - 1)):
+            pairs = sorted(zip(keys, vals), key=itemgetter(0))
+            keys, vals = [], []
+            for key, val in pairs:
+                if keys and not keys[-1] < key:
+                    vals[-1] = val
+                else:
+                    keys.append(key)
+                    vals.append(val)
+
+        tree = cls()
+        if keys:
+            black_height = (len(keys) + 1).bit_length() - 1
+            tree.root = _build(cls.Node, keys, vals, 0, len(keys), black_height)
+        return tree
+
+    def freeze(self):
+        """
+        Read-only snapshot of the tree for fast lookups, see FrozenLLRB.
+        """
+        keys, vals = [], []
+        for x in self._nodes():
+            keys.append(x.key)
+            vals.append(x.val)
+        return FrozenLLRB(keys, vals)
+
     def insert(self, key, value=None):
         """
         Insert a key with optional value into the tree.
+
+        See Node.insert.
         """
-        super(LeftRB, self).insert(key, value)
+        self.root = self.Node(key, value) if self.root is None else self.root.insert(key, value)
         self.root.color = BLACK
 
     def delete(self, key):
         """
         Delete a node with the given key from the tree.
+        Raise KeyError if the tree does not contain the key.
         """
-        if key not in self:
-            sys.stderr.write("Tree does not contain key '{0}'.\n".format(key))
-            return False
+        if self.root is None:
+            raise KeyError(key)
 
         if is_black(self.root.left) and is_black(self.root.right):
             self.root.color = RED
 
-        if self.root is not None:
-            self.root = self.root._delete(key)
+        self.root, found = self.root._delete(key)
 
         if not self.is_empty():
             self.root.color = BLACK
 
+        if not found:
+            raise KeyError(key)
+
     def delete_min(self):
         """
         Delete the smallest node while maintaining balance.
         """
+        if self.root is None:
+            return
+
+        if is_black(self.root.left) and is_black(self.root.right):
+            self.root.color = RED
+
         self.root = self.root._delete_min()
-        self.root.color = BLACK
+
+        if not self.is_empty():
+            self.root.color = BLACK
 
     def delete_max(self):
         """
         Delete the largest node while maintaining balance.
         """
+        if self.root is None:
+            return
+
+        if is_black(self.root.left) and is_black(self.root.right):
+            self.root.color = RED
+
         self.root = self.root._delete_max()
-        self.root.color = BLACK
 
+        if not self.is_empty():
+            self.root.color = BLACK
+
+
+class LeftRBSet(LeftRB):
+    """
+    Left-Leaning Red-Black tree of keys only.
+
+    Nodes have no slot for a value, which makes them smaller.
+    Inserting a key that is already in the set does nothing,
+    and search returns the key.
+    """
+    root = None
+
+    class Node(LeftRB.NodeMethods):
+        """
+        LeftRBSet tree node.
+        """
+        __slots__ = ('key', 'left', 'right', 'color', 'height', 'N')
+
+        def __init__(self, key, val=None):
+            self.key = key
+            self.left = self.right = None
+            self.color = RED  # new nodes are always red
+            self.height = 1
+            self.N = 1  # number of nodes in the subtree
+
+        @property
+        def val(self):
+            """
+            Sets have no values.
+            """
+            return None
 
-del BinarySearchTree
+        @val.setter
+        def val(self, value):
+            pass
@@ -21,3 +21,20 @@ class TestBST(object):
             t.insert(x)
         res = [t.search(x) for x in r]
         assert r == res
+
+    def test_len_with_duplicates(self):
+        t = Tree()
+        r = random.sample(range(1000), 500)
+        for x in r + r[:100]:
+            t.insert(x)
+        assert len(t) == len(r)
+
+    def test_iter(self):
+        t = Tree()
+        r = random.sample(range(1000), 500)
+        for x in r:
+            t.insert(x)
+        assert list(t) == sorted(r)
+        assert t.root.min() == min(r)
+        assert t.root.max() == max(r)
+        assert list(Tree()) == []
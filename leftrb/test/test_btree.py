@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import pytest
+import math
+import random
+
+from leftrb.btree import LeftB
+
+
+Tree = LeftB
+
+
+def fill_tree(items):
+    tree = Tree()
+    list(map(tree.insert, items))
+    return tree
+
+
+def check_node(x, lo=None, hi=None):
+    """
+    Check key order and fill of the subtree below x. Return its height.
+    """
+    assert 0 < len(x.keys) <= Tree.max_keys
+    assert len(x.vals) == len(x.keys)
+    assert x.keys == sorted(x.keys)
+    assert lo is None or lo < x.keys[0]
+    assert hi is None or x.keys[-1] < hi
+    if x.children is None:
+        return 1
+    assert len(x.children) == len(x.keys) + 1
+    bounds = [lo] + x.keys + [hi]
+    heights = set(check_node(c, bounds[i], bounds[i + 1]) for i, c in enumerate(x.children))
+    assert len(heights) == 1, "Leaves on different levels"
+    return 1 + heights.pop()
+
+
+class TestLeftB(object):
+
+    items = [5, 1, 3, 6]
+
+    def test_insert_and_search(self):
+        r = random.sample(range(1000), 900)
+        t = fill_tree(r)
+        assert [t.search(x) for x in r] == r
+        assert t.search(1000) is None
+        assert check_node(t.root) == t.height()
+
+    def test_values(self):
+        t = Tree()
+        for x in self.items:
+            t.insert(x, str(x))
+        t.insert(3, 'three')
+        assert t.search(3) == 'three'
+        assert t.search(5) == '5'
+        assert len(t) == len(self.items)
+
+    def test_len_and_in(self):
+        r = random.sample(range(1000), 500)
+        t = fill_tree(r + r[:100])
+        assert len(t) == len(r)
+        assert r[0] in t
+        assert 1000 not in t
+
+    def test_height(self):
+        n = 1000
+        t = fill_tree(random.sample(range(n), n))
+        assert t.height() <= int(math.ceil(math.log(n, (Tree.max_keys + 1) // 2))) + 1
+
+    def test_min_max(self):
+        r = random.sample(range(1000), 900)
+        t = fill_tree(r)
+        assert t.min() == min(r)
+        assert t.max() == max(r)
+
+    def test_empty(self):
+        t = Tree()
+        assert t.is_empty()
+        assert len(t) == 0
+        assert t.search(1) is None
+        assert t.min() is None and t.max() is None
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+
+import pytest
+import random
+
+from leftrb.frozen import FrozenLLRB
+from leftrb.llrb import LeftRB
+
+
+def freeze(items, values=False):
+    tree = LeftRB()
+    for x in items:
+        tree.insert(x, str(x) if values else None)
+    return tree.freeze()
+
+
+class TestFrozenLLRB(object):
+
+    def test_search(self):
+        for n in range(0, 40):
+            r = random.sample(range(0, 2 * n, 2), n)
+            t = freeze(r)
+            assert isinstance(t, FrozenLLRB)
+            assert len(t) == n
+            assert [t.search(x) for x in r] == r
+            # Misses below, between and above the keys
+            assert [t.search(x) for x in range(-1, 2 * n + 1, 2)] == [None] * (n + 1)
+
+    def test_values(self):
+        r = random.sample(range(1000), 900)
+        t = freeze(r, values=True)
+        assert [t.search(x) for x in r] == [str(x) for x in r]
+        assert r[0] in t
+        assert 1000 not in t
+
+    def test_min_max(self):
+        for n in range(1, 40):
+            r = random.sample(range(100), n)
+            t = freeze(r)
+            assert t.min() == min(r)
+            assert t.max() == max(r)
+
+    def test_empty(self):
+        t = FrozenLLRB([])
+        assert t.is_empty()
+        assert len(t) == 0
+        assert t.search(1) is None
+        assert t.min() is None and t.max() is None
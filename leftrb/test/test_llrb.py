@@ -8,7 +8,7 @@ import math
 import random
 
 from leftrb.test.test_bst import TestBST as Base
-from leftrb.llrb import LeftRB
+from leftrb.llrb import LeftRB, LeftRBSet, BLACK, is_red
 
 
 Tree = LeftRB
@@ -20,6 +20,25 @@ def fill_tree(items):
     return tree
 
 
+def check_llrb(h, lo=None, hi=None):
+    """
+    Check the search order, left-leaning red-black invariants,
+    heights and sizes of the subtree below h. Return its black height.
+    """
+    if h is None:
+        return 0
+    assert lo is None or lo < h.key
+    assert hi is None or h.key < hi
+    assert not is_red(h.right), "Right leaning red link"
+    assert not (is_red(h) and is_red(h.left)), "Two red links in a row"
+    left = check_llrb(h.left, lo, h.key)
+    right = check_llrb(h.right, h.key, hi)
+    assert left == right, "Unbalanced black links"
+    assert h.N == 1 + (h.left.N if h.left else 0) + (h.right.N if h.right else 0)
+    assert h.height == 1 + max(h.left.height if h.left else 0, h.right.height if h.right else 0)
+    return left + (0 if is_red(h) else 1)
+
+
 class TestLeftRB(Base):
 
     items = [5, 1, 3, 6]
@@ -38,6 +57,19 @@ class TestLeftRB(Base):
         t = fill_tree(self.items)
         assert len(t) == len(self.items)
 
+    def test_len_is_cached(self):
+        def check_size(h):
+            if h is None:
+                return 0
+            n = 1 + check_size(h.left) + check_size(h.right)
+            assert h.N == n
+            return n
+
+        items = random.sample(range(1000), 500)
+        t = fill_tree(items + items[:100])
+        assert len(t) == check_size(t.root) == len(items)
+        assert t.root.size() == len(items)
+
     def test_height(self):
         for n in range(1, 16):
             items = random.sample(range(n), n)
@@ -53,6 +85,14 @@ class TestLeftRB(Base):
         t = fill_tree(self.items)
         assert t.max() == max(self.items)
 
+    def test_iter(self):
+        items = random.sample(range(1000), 500)
+        t = fill_tree(items)
+        assert list(t) == sorted(items)
+        for x in items[:250]:
+            t.delete(x)
+        assert list(t) == sorted(items[250:])
+
     def test_delete(self):
         t = fill_tree(random.sample(range(100), 90))
 
@@ -62,3 +102,132 @@ class TestLeftRB(Base):
         assert value == t.search(key)
         t.delete(key)
         assert None == t.search(key)
+
+    def test_node_insert(self):
+        t = Tree.from_sorted(range(7))
+        t.root = t.root.insert(100, 'x')
+        t.root.color = BLACK
+        check_llrb(t.root)
+        assert len(t) == 8
+        assert t.search(100) == 'x'
+        assert (t.root.min(), t.root.max()) == (0, 100)
+
+    def test_subclass(self):
+        class SubTree(Tree):
+            class Node(Tree.Node):
+                __slots__ = ()
+
+        t = SubTree()
+        list(map(t.insert, self.items))
+        assert isinstance(t.root, SubTree.Node)
+        assert [t.search(x) for x in self.items] == self.items
+
+    def test_delete_missing(self):
+        items = random.sample(range(0, 200, 2), 90)
+        t = Tree.from_sorted(items)
+        for key in [-1, 1, 51, 199, 200]:
+            with pytest.raises(KeyError):
+                t.delete(key)
+            check_llrb(t.root)
+        assert len(t) == len(items)
+        assert [t.search(x) for x in items] == items
+        with pytest.raises(KeyError):
+            Tree().delete(1)
+
+    def test_insert_and_delete_keep_balance(self):
+        t = Tree()
+        keys = random.sample(range(200), 150)
+        for key in keys:
+            t.insert(key, str(key))
+            check_llrb(t.root)
+        for key in keys[:100]:
+            t.delete(key)
+            check_llrb(t.root)
+            assert key not in t
+        assert len(t) == 50
+        assert [t.search(x) for x in keys[100:]] == [str(x) for x in keys[100:]]
+
+    def test_delete_min_and_max(self):
+        keys = random.sample(range(200), 100)
+        t = fill_tree(keys)
+        keys.sort()
+        while keys:
+            if random.random() < 0.5:
+                t.delete_min()
+                keys.pop(0)
+            else:
+                t.delete_max()
+                keys.pop()
+            check_llrb(t.root)
+            assert len(t) == len(keys)
+            assert t.min() == (keys[0] if keys else None)
+            assert t.max() == (keys[-1] if keys else None)
+        assert t.is_empty()
+
+    def test_from_sorted(self):
+        for n in range(0, 100):
+            items = list(range(n))
+            t = Tree.from_sorted(items, [str(x) for x in items])
+            assert not is_red(t.root)
+            check_llrb(t.root)
+            assert len(t) == n
+            assert [t.search(x) for x in items] == [str(x) for x in items]
+            assert t.height() <= int(2 * math.ceil(math.log(n + 1, 2) + 1))
+
+    def test_from_sorted_unsorted_and_duplicates(self):
+        t = Tree.from_sorted([3, 1, 2, 1], ['c', 'a', 'b', 'A'])
+        check_llrb(t.root)
+        assert len(t) == 3
+        assert [t.search(x) for x in [1, 2, 3]] == ['A', 'b', 'c']
+
+    def test_from_sorted_length_mismatch(self):
+        with pytest.raises(ValueError):
+            Tree.from_sorted([3, 2, 1], ['a'])
+        with pytest.raises(ValueError):
+            Tree.from_sorted([1, 2, 3], ['a'])
+        with pytest.raises(ValueError):
+            Tree.from_sorted([1, 2], ['a', 'b', 'c'])
+
+    def test_from_sorted_then_update(self):
+        items = random.sample(range(1000), 500)
+        t = Tree.from_sorted(items)
+        for x in range(1000, 1100):
+            t.insert(x)
+        assert len(t) == 600
+        assert [t.search(x) for x in items] == items
+
+
+class TestLeftRBSet(object):
+
+    def test_insert_and_search(self):
+        t = LeftRBSet()
+        r = random.sample(range(1000), 500)
+        for x in r + r[:100]:
+            t.insert(x, 'ignored')
+        assert len(t) == len(r)
+        assert [t.search(x) for x in r] == r
+        assert t.min() == min(r) and t.max() == max(r)
+
+    def test_delete(self):
+        t = LeftRBSet()
+        for x in [5, 1, 3, 6]:
+            t.insert(x)
+        t.delete(1)
+        assert 1 not in t
+        assert len(t) == 3
+
+    def test_iter(self):
+        t = LeftRBSet()
+        for x in [5, 1, 3, 6]:
+            t.insert(x)
+        assert list(t) == [1, 3, 5, 6]
+
+    def test_node_insert(self):
+        h = LeftRBSet.Node(5)
+        for x in [1, 3, 6]:
+            h = h.insert(x)
+        assert (h.size(), h.min(), h.max()) == (4, 1, 6)
+
+    def test_no_value_slot(self):
+        assert 'val' not in LeftRBSet.Node.__slots__
+        assert not hasattr(LeftRBSet.Node(1), '__dict__')